@@ -1,12 +1,55 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import io
+import multiprocessing
+import os
+import queue
 import re
 import sys
+import threading
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from tkinter import ttk, messagebox, filedialog
 
 
+# Delete set for extracting digits from ASCII phones with bytes.translate
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+
+# Line breaks other than "\n" that str.splitlines() also splits on
+_OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+# One entry: a non-empty name line and the next non-empty line as its phone,
+# both with surrounding whitespace trimmed
+_ENTRY_RE = re.compile(
+    r"(?m)^[^\S\n]*(\S(?:[^\n]*\S)?)[^\S\n]*\n"
+    r"(?:[^\S\n]*\n)*[^\S\n]*(\S(?:[^\n]*\S)?)"
+)
+
+# Start of a non-empty line, used to keep entries whole when splitting input
+_NONEMPTY_LINE_RE = re.compile(r"(?m)^[^\S\n]*\S")
+
+# Inputs longer than this (in characters) are converted in worker processes;
+# below it, starting spawned workers costs more than it saves
+_PARALLEL_THRESHOLD = 1 << 23
+
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+_MAX_WORKERS = 61
+
+# Limits on collected warnings and on how many of them a dialog lists
+_MAX_WARNINGS = 10000
+_MAX_SHOWN_WARNINGS = 200
+
+# One vCard 3.0 block, filled with (name, phone)
+_VCARD_TMPL = "BEGIN:VCARD\nVERSION:3.0\nFN:%s\nTEL;TYPE=CELL:%s\nEND:VCARD"
+
+# Escaping of special characters in vCard text values (RFC 2426, section 4)
+_VCARD_ESC = str.maketrans({"\\": "\\\\", ",": "\\,", ";": "\\;", "\n": "\\n"})
+
+
+@lru_cache(maxsize=8192)
 def normalize_phone(raw_phone: str) -> str:
     """Normalize phone to +<digits>, e.g. +79251989091.
 
@@ -20,74 +63,184 @@ def normalize_phone(raw_phone: str) -> str:
     if raw_phone is None:
         return ""
 
+    # Fast paths: already normalized, or 11 bare digits
+    if raw_phone.isdecimal():
+        if len(raw_phone) == 11:
+            return "+7" + raw_phone[1:] if raw_phone[0] == "8" else "+" + raw_phone
+    elif len(raw_phone) == 12 and raw_phone[0] == "+" and raw_phone[1:].isdecimal():
+        return raw_phone
+
     phone = raw_phone.strip()
 
     # Extract digits
-    digits = re.sub(r"\D", "", phone)
+    if phone.isascii():
+        digits = phone.encode("ascii").translate(None, _NON_DIGIT_BYTES).decode("ascii")
+    else:
+        digits = "".join(filter(str.isdecimal, phone))
 
     # Preserve leading + if originally present
-    has_plus = phone.startswith("+")
-
-    if has_plus:
+    if phone[:1] == "+":
         return "+" + digits
 
-    if len(digits) == 11 and digits.startswith("8"):
-        return "+7" + digits[1:]
+    if not digits:
+        return ""
 
-    if len(digits) == 11 and digits.startswith("7"):
-        return "+" + digits
+    if len(digits) == 11 and digits[0] == "8":
+        return "+7" + digits[1:]
 
-    # Fallback: just add plus
-    return "+" + digits if digits else ""
+    # 11 digits starting with '7' and everything else: just add plus
+    return "+" + digits
 
 
-def parse_contacts(text: str):
-    """Parse input text into list of (name, phone) pairs.
+class _Warnings:
+    """Warnings of one conversion: the first _MAX_WARNINGS are kept, the rest counted.
 
-    The simplest rule per requirements: lines come in pairs: name line, then phone line.
-    Empty lines are ignored. If trailing name has no phone, it is ignored with a warning.
+    Wraps a list instead of subclassing it, so append() is the only way in
+    and the cap cannot be bypassed through extend(), += or insert().
     """
-    lines = [ln.strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-
-    pairs = []
-    warnings = []
-
-    i = 0
-    while i < len(lines):
-        name = lines[i]
-        phone = None
-        if i + 1 < len(lines):
-            phone = lines[i + 1]
-            i += 2
+
+    def __init__(self):
+        self._kept = []
+        self.suppressed = 0
+
+    def __len__(self):
+        return len(self._kept)
+
+    def __iter__(self):
+        return iter(self._kept)
+
+    def append(self, warning):
+        if len(self._kept) < _MAX_WARNINGS:
+            self._kept.append(warning)
         else:
-            i += 1
-            warnings.append(f"Строка с именем без телефона пропущена: '{name}'")
-            break
+            self.suppressed += 1
+
+    def merge(self, other):
+        for warning in other:
+            self.append(warning)
+        self.suppressed += other.suppressed
+
+    def lines(self):
+        """Return the kept warnings followed by a note on suppressed ones."""
+        lines = list(self._kept)
+        if self.suppressed:
+            lines.append(f"… и ещё {self.suppressed} предупреждений")
+        return lines
+
 
+def _normalize_line_breaks(text: str) -> str:
+    """Turn every line break that str.splitlines() knows into a plain newline."""
+    # Plain substring checks are much cheaper than splitting the common "\n"-only input
+    if any(sep in text for sep in _OTHER_LINE_BREAKS):
+        return "\n".join(text.splitlines())
+    return text
+
+
+def _iter_contacts(text: str, warnings: _Warnings):
+    """Yield (name, phone) pairs from input text one at a time.
+
+    Lines come in pairs: name line, then phone line. Empty lines are ignored.
+    Problems are appended to ``warnings`` instead of stopping the scan.
+    """
+    text = _normalize_line_breaks(text)
+    end = 0
+    for match in _ENTRY_RE.finditer(text):
+        name, phone = match.groups()
+        end = match.end()
         norm_phone = normalize_phone(phone)
         if not norm_phone:
             warnings.append(f"Не удалось распознать телефон для: '{name}' (строка: '{phone}')")
             continue
 
-        pairs.append((name, norm_phone))
+        yield name, norm_phone
+
+    # Anything left after the last entry is a single name without a phone
+    name = text[end:].strip()
+    if name:
+        warnings.append(f"Строка с именем без телефона пропущена: '{name}'")
+
+
+def parse_contacts(text: str):
+    """Parse input text into list of (name, phone) pairs.
 
-    return pairs, warnings
+    The simplest rule per requirements: lines come in pairs: name line, then phone line.
+    Empty lines are ignored. If trailing name has no phone, it is ignored with a warning.
+    """
+    warnings = _Warnings()
+    pairs = list(_iter_contacts(text, warnings))
+    return pairs, warnings.lines()
 
 
 def to_vcard(entries):
-    """Convert list of (name, phone) to vCard 3.0 blocks."""
-    blocks = []
+    """Convert iterable of (name, phone) to vCard 3.0 blocks."""
+    esc = _VCARD_ESC
+    buf = io.StringIO()
+    write = buf.write
+    sep = ""
     for name, phone in entries:
-        block = [
-            "BEGIN:VCARD",
-            "VERSION:3.0",
-            f"FN:{name}",
-            f"TEL;TYPE=CELL:{phone}",
-            "END:VCARD",
-        ]
-        blocks.append("\n".join(block))
-    return "\n".join(blocks)
+        write(sep)
+        write(_VCARD_TMPL % (name.translate(esc), phone))
+        sep = "\n"
+    return buf.getvalue()
+
+
+def _split_entries(text: str, parts: int):
+    """Split text into about ``parts`` chunks without breaking name/phone pairs."""
+    chunks = []
+    step = len(text) // parts + 1
+    start = 0
+    while start < len(text):
+        cut = text.find("\n", start + step)
+        if cut < 0:
+            cut = len(text)
+        elif len(_NONEMPTY_LINE_RE.findall(text, start, cut)) % 2:
+            # Odd number of lines so far: pull in the phone line of the last name
+            match = _NONEMPTY_LINE_RE.search(text, cut + 1)
+            cut = text.find("\n", match.end()) if match else -1
+            if cut < 0:
+                cut = len(text)
+        chunks.append(text[start:cut])
+        start = cut + 1
+    return chunks
+
+
+def _convert_chunk(text: str):
+    warnings = _Warnings()
+    return to_vcard(_iter_contacts(text, warnings)), warnings
+
+
+def _merge_results(results):
+    vcards = []
+    warnings = _Warnings()
+    for vcard, chunk_warnings in results:
+        if vcard:
+            vcards.append(vcard)
+        warnings.merge(chunk_warnings)
+    return "\n".join(vcards), warnings
+
+
+def convert_text(text: str):
+    """Convert input text to (vCard text, _Warnings).
+
+    Large inputs are split on entry boundaries and converted in parallel
+    worker processes; the result is the same as for a sequential run.
+    """
+    workers = min(os.cpu_count() or 1, _MAX_WORKERS)
+    if len(text) <= _PARALLEL_THRESHOLD or workers < 2:
+        vcard, warnings = _convert_chunk(text)
+    else:
+        text = _normalize_line_breaks(text)
+        # Spawn, not fork: this is called from a worker thread of the Tk process,
+        # and forking a multi-threaded process can deadlock the child
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            vcard, warnings = _merge_results(pool.map(_convert_chunk, _split_entries(text, workers)))
+    return vcard, warnings
+
+
+def _encode_vcf(data: str) -> bytes:
+    """Encode vCard text as .vcf file contents with native line endings."""
+    return data.replace("\n", os.linesep).encode("utf-8")
 
 
 class App(tk.Tk):
@@ -96,6 +249,12 @@ class App(tk.Tk):
         self.title("Текст → vCard (VCF)")
         self.geometry("980x540")
 
+        # Results of background conversions, handed over to the Tk thread
+        self._convert_queue = queue.Queue()
+        # Last conversion result and its encoded .vcf file contents
+        self._last_result = ""
+        self._last_result_utf8 = b""
+
         self._build_ui()
 
     def _build_ui(self):
@@ -140,10 +299,15 @@ class App(tk.Tk):
             controls.rowconfigure(_, weight=0)
         controls.rowconfigure(6, weight=1)
 
-        ttk.Button(controls, text="Преобразовать →", command=self.on_convert).grid(row=0, column=0, pady=(0, 6))
+        self.convert_button = ttk.Button(controls, text="Преобразовать →", command=self.on_convert)
+        self.convert_button.grid(row=0, column=0, pady=(0, 6))
         ttk.Button(controls, text="Копировать", command=self.on_copy).grid(row=1, column=0, pady=6)
         ttk.Button(controls, text="Сохранить .vcf", command=self.on_save).grid(row=2, column=0, pady=6)
-        ttk.Button(controls, text="Очистить", command=self.on_clear).grid(row=3, column=0, pady=6)
+        self.clear_button = ttk.Button(controls, text="Очистить", command=self.on_clear)
+        self.clear_button.grid(row=3, column=0, pady=6)
+
+        self.status_var = tk.StringVar()
+        ttk.Label(controls, textvariable=self.status_var).grid(row=4, column=0, pady=6)
 
         # Output Text with scrollbar
         output_frame = ttk.Frame(main)
@@ -151,7 +315,8 @@ class App(tk.Tk):
         output_frame.rowconfigure(0, weight=1)
         output_frame.columnconfigure(0, weight=1)
 
-        self.output_text = tk.Text(output_frame, wrap=tk.NONE)
+        # Output is only ever filled programmatically, so no undo history
+        self.output_text = tk.Text(output_frame, wrap=tk.NONE, undo=False)
         self.output_text.grid(row=0, column=0, sticky="nsew")
 
         out_scroll_y = ttk.Scrollbar(output_frame, orient="vertical", command=self.output_text.yview)
@@ -172,20 +337,92 @@ class App(tk.Tk):
             "+7 967 619-99-99\n"
         )
         self.input_text.insert("1.0", example)
+        # Start user undo history after the placeholder
+        self.input_text.edit_reset()
 
     def on_convert(self):
-        src = self.input_text.get("1.0", tk.END)
-        entries, warnings = parse_contacts(src)
+        src = self.input_text.get("1.0", "end-1c")
+
+        # Convert in a background thread and poll from the event loop,
+        # so the window stays responsive on large inputs
+        self.status_var.set("Преобразование…")
+        # Clearing mid-run would be undone when the result arrives
+        self.convert_button.state(["disabled"])
+        self.clear_button.state(["disabled"])
+        threading.Thread(target=self._do_convert, args=(src,), daemon=True).start()
+        self.after(20, self._poll_convert)
+
+    def _do_convert(self, src):
+        # Runs in the worker thread: no Tk calls here
+        try:
+            self._convert_queue.put(convert_text(src))
+        except Exception as exc:
+            self._convert_queue.put(exc)
 
-        result = to_vcard(entries)
+    def _poll_convert(self):
+        try:
+            outcome = self._convert_queue.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_convert)
+            return
+
+        self.status_var.set("")
+        self.convert_button.state(["!disabled"])
+        self.clear_button.state(["!disabled"])
+        if isinstance(outcome, Exception):
+            messagebox.showerror("Ошибка", f"Не удалось преобразовать текст\n{outcome}")
+            return
+        self._apply_result(*outcome)
+
+    def _apply_result(self, result, warnings):
         self.output_text.delete("1.0", tk.END)
         self.output_text.insert("1.0", result)
+        # Reset so _get_output can detect later manual edits
+        self.output_text.edit_modified(False)
+        self._last_result = result
+        self._last_result_utf8 = _encode_vcf(result)
 
         if warnings:
+            self._show_warnings(warnings)
+
+    def _show_warnings(self, warnings):
+        if len(warnings) <= 20 and not warnings.suppressed:
             messagebox.showwarning("Предупреждения", "\n".join(warnings))
+            return
+
+        # Too many for a message box: list the first ones in a scrollable window,
+        # counting both kept warnings past the limit and suppressed ones as hidden
+        text = "\n".join(islice(warnings, _MAX_SHOWN_WARNINGS))
+        hidden = max(len(warnings) - _MAX_SHOWN_WARNINGS, 0) + warnings.suppressed
+        if hidden:
+            text += f"\n… (ещё {hidden} не показано)"
+
+        win = tk.Toplevel(self)
+        win.title("Предупреждения")
+        win.geometry("700x400")
+        win.rowconfigure(0, weight=1)
+        win.columnconfigure(0, weight=1)
+
+        view = tk.Text(win, wrap=tk.NONE, undo=False)
+        view.grid(row=0, column=0, sticky="nsew")
+        view.insert("1.0", text)
+        view.configure(state=tk.DISABLED)
+
+        scroll_y = ttk.Scrollbar(win, orient="vertical", command=view.yview)
+        scroll_y.grid(row=0, column=1, sticky="ns")
+        view.configure(yscrollcommand=scroll_y.set)
+
+        ttk.Button(win, text="OK", command=win.destroy).grid(row=1, column=0, columnspan=2, pady=6)
+
+    def _get_output(self):
+        """Return output text and its .vcf bytes, reading the widget only if edited."""
+        if self.output_text.edit_modified():
+            data = self.output_text.get("1.0", "end-1c").strip()
+            return data, _encode_vcf(data)
+        return self._last_result, self._last_result_utf8
 
     def on_copy(self):
-        data = self.output_text.get("1.0", tk.END).strip()
+        data, _ = self._get_output()
         if not data:
             messagebox.showinfo("Копирование", "Нет данных для копирования")
             return
@@ -194,7 +431,7 @@ class App(tk.Tk):
         messagebox.showinfo("Копирование", "Готово. Результат скопирован в буфер обмена.")
 
     def on_save(self):
-        data = self.output_text.get("1.0", tk.END).strip()
+        data, payload = self._get_output()
         if not data:
             messagebox.showinfo("Сохранение", "Нет данных для сохранения")
             return
@@ -206,8 +443,8 @@ class App(tk.Tk):
         if not path:
             return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(data)
+            with open(path, "wb") as f:
+                f.write(payload)
             messagebox.showinfo("Сохранение", f"Файл сохранён: {path}")
         except Exception as exc:
             messagebox.showerror("Ошибка", f"Не удалось сохранить файл\n{exc}")
@@ -215,6 +452,10 @@ class App(tk.Tk):
     def on_clear(self):
         self.input_text.delete("1.0", tk.END)
         self.output_text.delete("1.0", tk.END)
+        self.output_text.edit_modified(False)
+        self._last_result = ""
+        self._last_result_utf8 = b""
+        normalize_phone.cache_clear()
 
     def _on_ctrl_v(self, event):
         # Ensure Ctrl+V works reliably
@@ -237,7 +478,6 @@ if __name__ == "__main__":
     # Ensure UTF-8 on Windows console if started from terminal
     try:
         if sys.platform.startswith("win"):
-            import os
             os.system("")
     except Exception:
         pass